@@ -3,9 +3,9 @@
 # requires-python = ">=3.10"
 # dependencies = [
 #     "rich>=13.0.0",
-#     "schedule>=1.2.0",
 #     "pydantic-ai-slim[anthropic]",
 #     "python-dotenv",
+#     "watchdog>=3.0",
 # ]
 # ///
 """
@@ -15,32 +15,79 @@ Supports both Claude and GLM systems.
 """
 
 import argparse
+import heapq
 import json
+import math
 import os
+import queue
 import signal
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
-import schedule
-from dotenv import dotenv_values
-from pydantic_ai import Agent
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.providers.anthropic import AnthropicProvider
 from rich.console import Console
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
 
 console = Console()
 
 
+@lru_cache(maxsize=256)
+def _decode_project_id(project_id: str) -> str:
+    if project_id.startswith("-"):
+        return "/" + project_id[1:].replace("-", "/")
+    return project_id
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _fmt_time(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+class ActivityEventHandler(FileSystemEventHandler):
+    """Forward .jsonl file events to a monitor."""
+
+    def __init__(self, monitor: "BaseAIMonitor"):
+        super().__init__()
+        self.monitor = monitor
+
+    def on_created(self, event):
+        self._handle(event.src_path, event.is_directory)
+
+    def on_modified(self, event):
+        self._handle(event.src_path, event.is_directory)
+
+    def on_moved(self, event):
+        self._handle(event.dest_path, event.is_directory)
+
+    def _handle(self, path, is_directory: bool):
+        if is_directory:
+            return
+        path = os.fsdecode(path)
+        if path.endswith(".jsonl"):
+            self.monitor.record_activity(path)
+
+
 class BaseAIMonitor(ABC):
     """Base class for AI activity monitoring."""
 
@@ -58,56 +105,135 @@ class BaseAIMonitor(ABC):
         self.check_interval = 0.5  # minutes (30 seconds)
         self.idle_threshold = 10  # minutes
 
-        self.last_activity_time: Optional[datetime] = None
+        # Display strings for the configuration rows, fixed after construction
+        self._directory_str = str(self.directory)
+        self._prompt_display = _truncate(self.prompt, 40)
+
+        self.last_activity_time: Optional[float] = None  # Unix timestamp, for display
+        self.last_activity_mono: Optional[float] = None  # time.monotonic(), for idle checks
         self.last_activity_file: Optional[str] = None
         self.last_activity_project_file: Optional[str] = None
+        self.decoded_project_path: Optional[str] = None
         self.last_prompt: Optional[str] = None
+        self._history_offset = 0  # Bytes of history.jsonl already parsed
+        self._history_prompt: Optional[str] = None
+        self._history_lock = threading.Lock()
         self.last_check_time: Optional[datetime] = None
-        self.execution_logs: list[str] = []
         self.max_logs = 5
+        self.execution_logs: deque[str] = deque(maxlen=self.max_logs)
+        self._pending_logs: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._execution: Optional[Future] = None
+        self.version = 0  # Bumped whenever displayed state changes
 
         # File paths to monitor
         self.history_file = monitor_base_path / "history.jsonl"
         self.projects_dir = monitor_base_path / "projects"
+        self._history_file_str = str(self.history_file)
+        self._projects_dir_str = str(self.projects_dir)
+
+        # Directory listing cache: dir path -> (dir mtime, jsonl files, subdirs)
+        self._scan_cache: dict[str, tuple[float, list[str], list[str]]] = {}
+
+        # File system watcher pushing activity updates
+        self._observer = Observer()
+        self._event_handler = ActivityEventHandler(self)
+        # Only history.jsonl's directory and projects/ matter; watching the
+        # whole base path recursively would also cover node_modules and friends
+        self._watch_paths = (
+            (str(monitor_base_path), False),
+            (self._projects_dir_str, True),
+        )
+        self._watched: set[str] = set()
+        self._watch_warned: set[str] = set()
+
+    def _iter_jsonl_mtimes(self, dir_path: str, visited: set[str]) -> Iterator[tuple[float, str]]:
+        """Yield (mtime, file_path) for every .jsonl file below dir_path.
+
+        Directory listings are cached and only re-read when the directory's
+        own mtime changes. Freshly listed files take their mtime from the
+        os.DirEntry; files from a cached listing are stat()ed directly,
+        because appending to an existing file does not touch the mtime of
+        its parent directory.
+        """
+        try:
+            dir_mtime = os.stat(dir_path).st_mtime
+        except OSError:
+            return
+        visited.add(dir_path)
+
+        cached = self._scan_cache.get(dir_path)
+        if cached is not None and cached[0] == dir_mtime:
+            _, files, subdirs = cached
+            for file_path in files:
+                try:
+                    yield (os.stat(file_path).st_mtime, file_path)
+                except OSError:
+                    continue
+        else:
+            files = []
+            subdirs = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(".jsonl") and entry.is_file():
+                            files.append(entry.path)
+                            yield (entry.stat().st_mtime, entry.path)
+            except OSError:
+                return
+            self._scan_cache[dir_path] = (dir_mtime, files, subdirs)
+
+        for subdir in subdirs:
+            yield from self._iter_jsonl_mtimes(subdir, visited)
+
+    def _scan_projects_dir(self) -> Optional[tuple[float, str]]:
+        """Find the most recently modified .jsonl file under projects_dir.
+
+        Returns:
+            Tuple of (mtime, file_path), or None if no .jsonl file exists
+        """
+        visited: set[str] = set()
+        latest = max(self._iter_jsonl_mtimes(self._projects_dir_str, visited), default=None)
 
-    def get_latest_modification_time(self) -> Optional[tuple[datetime, str, Optional[str]]]:
+        # Forget directories that no longer exist
+        for dir_path in self._scan_cache.keys() - visited:
+            del self._scan_cache[dir_path]
+
+        return latest
+
+    def get_latest_modification_time(self) -> Optional[tuple[float, str, Optional[str]]]:
         """Get the most recent modification time and file paths.
 
         Returns:
             Tuple of (latest_time, latest_file, latest_project_file)
-            - latest_time: Most recent modification time across all files
+            - latest_time: Most recent modification time across all files (Unix timestamp)
             - latest_file: Path to the most recently modified file (history or project)
             - latest_project_file: Path to the most recently modified project file (None if no project activity)
         """
-        latest_time = None
+        latest_mtime = None
         latest_file = None
-        latest_project_time = None
         latest_project_file = None
 
         # Check history.jsonl
-        if self.history_file.exists():
-            mtime = datetime.fromtimestamp(self.history_file.stat().st_mtime)
-            if latest_time is None or mtime > latest_time:
-                latest_time = mtime
-                latest_file = str(self.history_file)
+        try:
+            latest_mtime = os.stat(self._history_file_str).st_mtime
+            latest_file = self._history_file_str
+        except OSError:
+            pass
 
         # Check all .jsonl files in projects directory
-        if self.projects_dir.exists():
-            for jsonl_file in self.projects_dir.rglob("*.jsonl"):
-                mtime = datetime.fromtimestamp(jsonl_file.stat().st_mtime)
-
-                # Track overall latest
-                if latest_time is None or mtime > latest_time:
-                    latest_time = mtime
-                    latest_file = str(jsonl_file)
-
-                # Track latest project file separately
-                if latest_project_time is None or mtime > latest_project_time:
-                    latest_project_time = mtime
-                    latest_project_file = str(jsonl_file)
-
-        if latest_time and latest_file:
-            return (latest_time, latest_file, latest_project_file)
+        latest_project = self._scan_projects_dir()
+        if latest_project:
+            latest_project_mtime, latest_project_file = latest_project
+
+            # Track overall latest
+            if latest_mtime is None or latest_project_mtime > latest_mtime:
+                latest_mtime = latest_project_mtime
+                latest_file = latest_project_file
+
+        if latest_mtime and latest_file:
+            return (latest_mtime, latest_file, latest_project_file)
         return None
 
     def decode_project_id(self, project_id: str) -> str:
@@ -116,30 +242,65 @@ class BaseAIMonitor(ABC):
         AI systems encode project paths like: -Users-dj-github-darjeeling-glmctl
         This decodes it back to: /Users/dj/github/darjeeling/glmctl
         """
-        if project_id.startswith("-"):
-            return "/" + project_id[1:].replace("-", "/")
-        return project_id
+        return _decode_project_id(project_id)
 
     def get_last_prompt(self) -> Optional[str]:
         """Get the last prompt from history.jsonl file.
 
         Returns the 'display' field from the last line of history.jsonl.
+        The file is append-only, so only the bytes added since the previous
+        call are read; nothing is read at all if the size is unchanged.
         """
-        try:
-            if not self.history_file.exists():
-                return None
-
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if not lines:
-                    return None
+        # Called from both the watcher thread and the initial check
+        with self._history_lock:
+            return self._read_last_prompt()
 
-                # Get last non-empty line
-                for line in reversed(lines):
-                    line = line.strip()
-                    if line:
-                        data = json.loads(line)
-                        return data.get('display')
+    def _read_last_prompt(self) -> Optional[str]:
+        try:
+            # A missing file raises here and falls through to return None
+            size = os.stat(self._history_file_str).st_size
+            if size == self._history_offset:
+                return self._history_prompt
+
+            prompt = self._history_prompt
+            with open(self._history_file_str, 'rb') as f:
+                if 0 < self._history_offset < size:
+                    f.seek(self._history_offset)
+                    chunk = f.read(size - self._history_offset)
+                else:
+                    prompt = None
+                    # First read or truncated file: read backwards in growing
+                    # blocks until a full last line is found
+                    block = 1024
+                    while True:
+                        start = max(0, size - block)
+                        f.seek(start)
+                        chunk = f.read(size - start)
+                        if b"\n" in chunk.rstrip() or start == 0:
+                            break
+                        block *= 2
+
+            # Get last non-empty line
+            lines = chunk.split(b"\n")
+            offset = size
+            for index in range(len(lines) - 1, -1, -1):
+                line = lines[index].strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    if index != len(lines) - 1:
+                        raise
+                    # Last line is still being written, re-read it next time
+                    offset = size - len(lines[index])
+                    continue
+                prompt = data.get('display')
+                break
+
+            self._history_offset = offset
+            self._history_prompt = prompt
+            return prompt
 
         except Exception:
             # Silently ignore errors
@@ -147,36 +308,149 @@ class BaseAIMonitor(ABC):
 
         return None
 
-    def is_idle(self) -> bool:
+    def is_idle(self, mono_now: Optional[float] = None) -> bool:
         """Check if AI has been idle for longer than threshold."""
-        if self.last_activity_time is None:
+        if self.last_activity_mono is None:
             return False
 
-        idle_duration = datetime.now() - self.last_activity_time
-        return idle_duration >= timedelta(minutes=self.idle_threshold)
+        if mono_now is None:
+            mono_now = time.monotonic()
+        return mono_now - self.last_activity_mono >= self.idle_threshold * 60
 
-    def get_idle_duration(self) -> Optional[timedelta]:
-        """Get current idle duration."""
-        if self.last_activity_time is None:
+    def get_idle_duration(self, mono_now: Optional[float] = None) -> Optional[float]:
+        """Get current idle duration in seconds."""
+        if self.last_activity_mono is None:
             return None
-        return datetime.now() - self.last_activity_time
+        if mono_now is None:
+            mono_now = time.monotonic()
+        return mono_now - self.last_activity_mono
+
+    def _set_activity_time(self, timestamp: float):
+        """Record activity at a Unix timestamp, mirrored on the monotonic clock."""
+        self.last_activity_time = timestamp
+        self.last_activity_mono = time.monotonic() - (time.time() - timestamp)
 
     def check_and_update_activity(self):
         """Check for activity and update last activity time."""
         self.last_check_time = datetime.now()
         result = self.get_latest_modification_time()
 
-        if result:
-            self.last_activity_time, self.last_activity_file, self.last_activity_project_file = result
+        # Never overwrite newer activity already seen by the watcher
+        if result and (self.last_activity_time is None or result[0] >= self.last_activity_time):
+            activity_time, self.last_activity_file, project_file = result
+            self._set_activity_time(activity_time)
+            self._set_project_file(project_file)
 
         # Update last prompt from history.jsonl
         self.last_prompt = self.get_last_prompt()
+        self.version += 1
+
+    def record_activity(self, file_path: str):
+        """Record activity reported by the file system watcher."""
+        if file_path == self._history_file_str:
+            self._set_activity_time(time.time())
+            self.last_activity_file = file_path
+            # Update last prompt only when history.jsonl changed
+            self.last_prompt = self.get_last_prompt()
+        elif file_path.startswith(self._projects_dir_str + os.sep):
+            self._set_activity_time(time.time())
+            self.last_activity_file = file_path
+            self._set_project_file(file_path)
+        else:
+            return
+        self.version += 1
+
+    def _set_project_file(self, file_path: Optional[str]):
+        """Update the last project file and its decoded project path."""
+        if file_path == self.last_activity_project_file:
+            return
+
+        self.last_activity_project_file = file_path
+        self.decoded_project_path = None
+        if file_path:
+            try:
+                relative = Path(file_path).relative_to(self.projects_dir)
+                # Decode project ID to actual path
+                self.decoded_project_path = self.decode_project_id(relative.parts[0])
+            except ValueError:
+                pass
+
+    def export_state(self) -> dict:
+        """Export derived state to persist between restarts."""
+        return {
+            "last_activity_time": self.last_activity_time,
+            "last_activity_file": self.last_activity_file,
+            "last_activity_project_file": self.last_activity_project_file,
+            "last_prompt": self._history_prompt,
+            "history_offset": self._history_offset,
+            "scan_cache": dict(self._scan_cache),
+        }
+
+    def load_state(self, state: dict):
+        """Seed derived state saved by export_state()."""
+        if state.get("last_activity_time") is not None:
+            self._set_activity_time(state["last_activity_time"])
+        self.last_activity_file = state.get("last_activity_file")
+        self._set_project_file(state.get("last_activity_project_file"))
+        self.last_prompt = self._history_prompt = state.get("last_prompt")
+        self._history_offset = state.get("history_offset", 0)
+        self._scan_cache = {
+            dir_path: (dir_mtime, files, subdirs)
+            for dir_path, (dir_mtime, files, subdirs) in state.get("scan_cache", {}).items()
+        }
+        self.version += 1
+
+    def start_watching(self) -> bool:
+        """Start watching the base path (non-recursive) and projects/ for file changes.
+
+        Safe to call repeatedly: paths that are missing or could not be
+        watched are retried. Returns True once every path is watched;
+        until then the caller should rescan periodically.
+        """
+        if not self._observer.is_alive():
+            # Start first so scheduling errors (e.g. inotify watch limit) raise here
+            self._observer.start()
+
+        for path, recursive in self._watch_paths:
+            if path in self._watched:
+                continue
+            if not os.path.isdir(path):
+                if path not in self._watch_warned:
+                    self._watch_warned.add(path)
+                    self.add_log(f"Warning: {path} not found, rechecking periodically")
+                continue
+            try:
+                self._observer.schedule(self._event_handler, path, recursive=recursive)
+            except OSError as e:
+                if path not in self._watch_warned:
+                    self._watch_warned.add(path)
+                    self.add_log(f"Warning: cannot watch {path} ({e}), rechecking periodically")
+                continue
+            self._watched.add(path)
+
+        return len(self._watched) == len(self._watch_paths)
+
+    def stop_watching(self):
+        """Stop the file system watcher."""
+        if self._observer.is_alive():
+            self._observer.stop()
+            self._observer.join()
 
     def add_log(self, message: str):
-        """Add a log message (keep last N messages)."""
-        self.execution_logs.append(f"[{self.name}] {message}")
-        if len(self.execution_logs) > self.max_logs:
-            self.execution_logs.pop(0)
+        """Add a log message (keep last N messages).
+
+        Safe to call from worker threads: messages are queued and moved
+        into execution_logs by flush_logs() on the main thread.
+        """
+        self._pending_logs.put(f"[{self.name}] {message}")
+
+    def flush_logs(self):
+        """Move queued log messages into execution_logs."""
+        if self._pending_logs.empty():
+            return
+        while not self._pending_logs.empty():
+            self.execution_logs.append(self._pending_logs.get())
+        self.version += 1
 
     @abstractmethod
     def execute_when_idle(self):
@@ -187,22 +461,46 @@ class BaseAIMonitor(ABC):
         """
         pass
 
-    def run_if_idle(self):
-        """Execute action if idle and at top of the hour."""
-        if not self.is_idle():
+    def cancel_execution(self):
+        """Stop a running execute_when_idle() on shutdown, if the subclass can."""
+        pass
+
+    def run_if_idle(
+        self,
+        executor: Executor,
+        now: Optional[float] = None,
+        mono_now: Optional[float] = None,
+    ):
+        """Execute action on the executor if idle and at top of the hour."""
+        if now is None:
+            now = time.time()
+
+        # Cheapest checks first; no datetime is built on the no-op path
+        if time.localtime(now).tm_min != 0:  # Only run at top of the hour
             return
 
-        now = datetime.now()
-        if now.minute != 0:  # Only run at top of the hour
+        if not self.is_idle(mono_now):
+            return
+
+        timestamp = _fmt_time(now)
+        if self._execution is not None and not self._execution.done():
+            self.add_log(f"[{timestamp}] Skipped: previous execution still running")
             return
 
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
         log_msg = f"[{timestamp}] Executing in {self.directory}"
         self.add_log(log_msg)
 
-        try:
-            self.execute_when_idle()
-        except Exception as e:
+        self._execution = executor.submit(self.execute_when_idle)
+        self._execution.add_done_callback(
+            lambda future: self._on_execution_done(future, timestamp)
+        )
+
+    def _on_execution_done(self, future: Future, timestamp: str):
+        """Log errors escaping execute_when_idle (runs on the worker thread)."""
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is not None:
             self.add_log(f"[{timestamp}] Error: {type(e).__name__}: {str(e)[:100]}")
 
 
@@ -216,27 +514,39 @@ class ClaudeMonitor(BaseAIMonitor):
             prompt=prompt,
             monitor_base_path=Path.home() / ".claude",
         )
+        # Running claude process, so shutdown can terminate it
+        self._process: Optional[subprocess.Popen] = None
 
     def execute_when_idle(self):
         """Execute claude command."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         try:
-            result = subprocess.run(
+            with subprocess.Popen(
                 ["claude", "-p", self.prompt],
                 cwd=self.directory,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=300,
-            )
-
-            if result.returncode == 0:
+                start_new_session=True,  # Own process group, see cancel_execution()
+            ) as process:
+                self._process = process
+                try:
+                    _, stderr = process.communicate(timeout=300)
+                except subprocess.TimeoutExpired:
+                    os.killpg(process.pid, signal.SIGKILL)
+                    process.communicate()
+                    raise
+                finally:
+                    self._process = None
+
+            if process.returncode == 0:
                 self.add_log(f"[{timestamp}] Execution completed successfully")
             else:
-                self.add_log(f"[{timestamp}] Execution failed (returncode: {result.returncode})")
-                if result.stderr:
+                self.add_log(f"[{timestamp}] Execution failed (returncode: {process.returncode})")
+                if stderr:
                     # Log first 200 chars of stderr
-                    stderr_msg = result.stderr[:200].replace('\n', ' ')
+                    stderr_msg = stderr[:200].replace('\n', ' ')
                     self.add_log(f"[{timestamp}] Error: {stderr_msg}")
 
         except subprocess.TimeoutExpired:
@@ -246,6 +556,19 @@ class ClaudeMonitor(BaseAIMonitor):
         except Exception as e:
             self.add_log(f"[{timestamp}] Error: {type(e).__name__}: {str(e)[:100]}")
 
+    def cancel_execution(self):
+        """Terminate a running claude process so its worker thread can finish.
+
+        The whole process group is signalled, since helpers spawned by claude
+        would otherwise keep the output pipes open.
+        """
+        process = self._process
+        if process is not None and process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+
 
 class GLMMonitor(BaseAIMonitor):
     """Monitor for GLM AI system."""
@@ -259,18 +582,25 @@ class GLMMonitor(BaseAIMonitor):
             prompt=prompt,
             monitor_base_path=Path.home() / ".glmenv" / "claude",
         )
-        self.agent: Optional[Agent] = None
+        self.agent: Optional["Agent"] = None
         self._initialize_agent()
 
     def _initialize_agent(self):
         """Initialize Pydantic AI agent with GLM configuration."""
         try:
+            from dotenv import dotenv_values
+
             config = dotenv_values(Path(self.GLMENV_ENV).expanduser())
 
             if not config.get("ANTHROPIC_AUTH_TOKEN") or not config.get("ANTHROPIC_BASE_URL"):
                 console.print(f"[yellow]Warning: GLM config incomplete in {self.GLMENV_ENV}[/yellow]")
                 return
 
+            # Imported here so Claude-only runs never load pydantic_ai
+            from pydantic_ai import Agent
+            from pydantic_ai.models.anthropic import AnthropicModel
+            from pydantic_ai.providers.anthropic import AnthropicProvider
+
             model = AnthropicModel(
                 "glm-4.5-air",
                 provider=AnthropicProvider(
@@ -306,6 +636,8 @@ class GLMMonitor(BaseAIMonitor):
 class MultiMonitor:
     """Orchestrator for multiple AI monitors."""
 
+    STATE_FILE = "~/.cache/ai_idle_monitor/state.json"
+
     def __init__(
         self,
         claude_monitor: Optional[ClaudeMonitor] = None,
@@ -314,6 +646,16 @@ class MultiMonitor:
         self.claude_monitor = claude_monitor
         self.glm_monitor = glm_monitor
         self.running = True
+        self.save_interval = 5  # minutes
+        self._saved_versions: Optional[tuple[int, ...]] = None  # Monitor versions last persisted
+
+        # Idle actions run here so the TUI keeps refreshing meanwhile
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+        # Cached layout, rebuilt only when a monitor's state changes
+        self._layout: Optional[Layout] = None
+        self._layout_key: Optional[tuple] = None
+        self._dynamic_cells: list[tuple[BaseAIMonitor, Text, Text, Text]] = []
 
     def get_active_monitors(self) -> list[BaseAIMonitor]:
         """Get list of active monitors."""
@@ -329,32 +671,56 @@ class MultiMonitor:
         for monitor in self.get_active_monitors():
             monitor.check_and_update_activity()
 
-    def run_all_if_idle(self):
+    def run_all_if_idle(self, now: Optional[float] = None, mono_now: Optional[float] = None):
         """Run all monitors if idle."""
+        if now is None:
+            now = time.time()
+        if mono_now is None:
+            mono_now = time.monotonic()
         for monitor in self.get_active_monitors():
-            monitor.run_if_idle()
+            monitor.run_if_idle(self._executor, now, mono_now)
 
-    def generate_display(self) -> Layout:
-        """Generate the TUI display for all monitors."""
-        layout = Layout()
+    def generate_display(self, now: Optional[float] = None, mono_now: Optional[float] = None) -> Layout:
+        """Generate the TUI display for all monitors.
+
+        The layout is cached and only rebuilt when a monitor's version or
+        idle state changes; otherwise just the time-dependent cells are
+        updated in place.
+        """
         monitors = self.get_active_monitors()
 
         if not monitors:
             return Layout(Panel("No monitors active", title="AI Idle Monitor"))
 
+        if now is None:
+            now = time.time()
+        if mono_now is None:
+            mono_now = time.monotonic()
+
+        for monitor in monitors:
+            monitor.flush_logs()
+
+        layout_key = tuple((monitor.version, monitor.is_idle(mono_now)) for monitor in monitors)
+        if self._layout is not None and layout_key == self._layout_key:
+            for cells in self._dynamic_cells:
+                self._update_dynamic_cells(*cells, now=now, mono_now=mono_now)
+            return self._layout
+
+        layout = Layout()
+        self._dynamic_cells = []
+
         # Create monitor panels
         monitor_panels = []
         for monitor in monitors:
-            panel = self._create_monitor_panel(monitor)
+            panel = self._create_monitor_panel(monitor, now, mono_now)
             monitor_panels.append(Layout(panel))
 
-        # Collect all logs
-        all_logs = []
-        for monitor in monitors:
-            all_logs.extend(monitor.execution_logs)
-
-        # Sort logs by timestamp (they start with [name] [timestamp])
-        all_logs.sort()
+        # Merge the per-monitor logs, each already in timestamp order
+        # (they start with [name] [timestamp])
+        all_logs = list(heapq.merge(
+            *(monitor.execution_logs for monitor in monitors),
+            key=lambda log: log.split("] ", 1)[-1],
+        ))
         logs_text = "\n".join(all_logs[-10:]) if all_logs else "No executions yet"
         logs_panel = Layout(Panel(logs_text, title="Execution Log", border_style="green"))
 
@@ -366,42 +732,79 @@ class MultiMonitor:
             monitors_layout.split_row(*monitor_panels)
             layout.split_column(monitors_layout, logs_panel)
 
+        self._layout = layout
+        self._layout_key = layout_key
         return layout
 
-    def _create_monitor_panel(self, monitor: BaseAIMonitor) -> Panel:
+    def _update_dynamic_cells(
+        self,
+        monitor: BaseAIMonitor,
+        time_cell: Text,
+        status_cell: Text,
+        next_exec_cell: Text,
+        now: float,
+        mono_now: float,
+    ):
+        """Refresh the cells of a monitor panel that change every second."""
+        time_cell.plain = _fmt_time(now)
+
+        idle_duration = monitor.get_idle_duration(mono_now)
+        if idle_duration:
+            minutes = int(idle_duration / 60)
+            if monitor.is_idle(mono_now):
+                status_cell.plain = f"IDLE ({minutes} minutes)"
+                status_cell.style = "bold red"
+            else:
+                status_cell.plain = f"Active ({minutes} minutes since last activity)"
+                status_cell.style = "bold green"
+        else:
+            status_cell.plain = "Initializing..."
+            status_cell.style = ""
+
+        next_exec_cell.plain = self.get_next_hour(now).strftime("%H:%M:%S")
+
+    def _create_monitor_panel(
+        self,
+        monitor: BaseAIMonitor,
+        now: Optional[float] = None,
+        mono_now: Optional[float] = None,
+    ) -> Panel:
         """Create a panel for a single monitor."""
+        if now is None:
+            now = time.time()
+        if mono_now is None:
+            mono_now = time.monotonic()
+
         table = Table.grid(padding=(0, 2))
         table.add_column(style="cyan", justify="right")
         table.add_column(style="white")
 
+        # Cells refreshed in place while the layout is cached
+        time_cell = Text()
+        status_cell = Text()
+        next_exec_cell = Text(style="bold yellow")
+        self._update_dynamic_cells(monitor, time_cell, status_cell, next_exec_cell, now, mono_now)
+        self._dynamic_cells.append((monitor, time_cell, status_cell, next_exec_cell))
+
         # Current time
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        table.add_row("Current Time:", current_time)
+        table.add_row("Current Time:", time_cell)
 
         # Last activity
         if monitor.last_activity_time:
-            last_activity = monitor.last_activity_time.strftime("%Y-%m-%d %H:%M:%S")
+            last_activity = _fmt_time(monitor.last_activity_time)
             table.add_row("Last Activity:", last_activity)
 
             # Show last project (always show if available)
-            if monitor.last_activity_project_file:
-                project_path = Path(monitor.last_activity_project_file)
-                try:
-                    relative = project_path.relative_to(monitor.projects_dir)
-                    project_id = relative.parts[0]
-                    # Decode project ID to actual path
-                    actual_path = monitor.decode_project_id(project_id)
-                    table.add_row(
-                        "Last Project:",
-                        Text(actual_path, style="bold cyan")
-                    )
-                except ValueError:
-                    pass
+            if monitor.decoded_project_path:
+                table.add_row(
+                    "Last Project:",
+                    Text(monitor.decoded_project_path, style="bold cyan")
+                )
 
             # Show last prompt
             if monitor.last_prompt:
                 # Truncate if too long
-                prompt_display = monitor.last_prompt[:80] + "..." if len(monitor.last_prompt) > 80 else monitor.last_prompt
+                prompt_display = _truncate(monitor.last_prompt, 80)
                 table.add_row(
                     "Last Prompt:",
                     Text(prompt_display, style="dim white")
@@ -410,54 +813,126 @@ class MultiMonitor:
             table.add_row("Last Activity:", "Checking...")
 
         # Idle status
-        idle_duration = monitor.get_idle_duration()
-        if idle_duration:
-            minutes = int(idle_duration.total_seconds() / 60)
-            if monitor.is_idle():
-                idle_text = Text(f"IDLE ({minutes} minutes)", style="bold red")
-            else:
-                idle_text = Text(f"Active ({minutes} minutes since last activity)", style="bold green")
-            table.add_row("Status:", idle_text)
-        else:
-            table.add_row("Status:", "Initializing...")
+        table.add_row("Status:", status_cell)
 
         # Next execution (if idle)
-        if monitor.is_idle():
-            next_hour = monitor.get_next_hour().strftime("%H:%M:%S")
-            table.add_row("Next Execution:", Text(next_hour, style="bold yellow"))
+        if monitor.is_idle(mono_now):
+            table.add_row("Next Execution:", next_exec_cell)
 
         # Configuration
         table.add_row("", "")
-        table.add_row("Target Directory:", str(monitor.directory))
-        table.add_row("Prompt:", monitor.prompt[:40] + "..." if len(monitor.prompt) > 40 else monitor.prompt)
+        table.add_row("Target Directory:", monitor._directory_str)
+        table.add_row("Prompt:", monitor._prompt_display)
 
         return Panel(table, title=f"{monitor.name} Monitor", border_style="blue")
 
-    def get_next_hour(self) -> datetime:
+    def get_next_hour(self, now: Optional[float] = None) -> datetime:
         """Get the next top of the hour."""
-        now = datetime.now()
+        now = datetime.now() if now is None else datetime.fromtimestamp(now)
         next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         return next_hour
 
+    def _next_hour_deadline(self) -> float:
+        """Get the next top of the hour as a time.monotonic() deadline."""
+        return time.monotonic() + (self.get_next_hour() - datetime.now()).total_seconds()
+
+    def load_state(self):
+        """Seed monitors from the state file written by save_state()."""
+        try:
+            with open(Path(self.STATE_FILE).expanduser(), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            for monitor in self.get_active_monitors():
+                if monitor.name in state:
+                    monitor.load_state(state[monitor.name])
+            # Monitors now match the file; don't write it back unchanged
+            self._saved_versions = tuple(monitor.version for monitor in self.get_active_monitors())
+        except Exception:
+            # Missing or unreadable state only means a cold start
+            pass
+
+    def save_state(self):
+        """Atomically write monitor state to the state file, if any monitor changed."""
+        monitors = self.get_active_monitors()
+        versions = tuple(monitor.version for monitor in monitors)
+        if versions == self._saved_versions:
+            return
+
+        state_file = Path(self.STATE_FILE).expanduser()
+        state = {monitor.name: monitor.export_state() for monitor in monitors}
+        tmp_name = None
+        try:
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=state_file.parent, delete=False
+            ) as f:
+                tmp_name = f.name
+                json.dump(state, f)
+            os.replace(tmp_name, state_file)
+            self._saved_versions = versions
+        except OSError:
+            # Silently ignore errors; state is only a startup optimization.
+            # Don't leave the temporary file behind, though.
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
     def start(self):
         """Start the monitoring loop with TUI."""
-        # Initial check
-        self.check_all_activity()
-
-        # Schedule tasks
-        schedule.every(0.5).minutes.do(self.check_all_activity)
-        schedule.every().hour.at(":00").do(self.run_all_if_idle)
+        # Seed from the last run so the TUI starts without a full scan; the
+        # initial check runs in the background, later activity is pushed by
+        # the file watchers
+        self.load_state()
+        unwatched = [monitor for monitor in self.get_active_monitors() if not monitor.start_watching()]
+        self._executor.submit(self.check_all_activity)
 
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
-        # Run with live display
-        with Live(self.generate_display(), refresh_per_second=1, console=console) as live:
-            while self.running:
-                schedule.run_pending()
-                live.update(self.generate_display())
-                time.sleep(1)
+        # Run with live display, sleeping until the next deadline
+        monitors = self.get_active_monitors()
+        next_refresh = time.monotonic()
+        next_hour = self._next_hour_deadline()
+        next_save = time.monotonic() + self.save_interval * 60
+        # Monitors with missing or unwatchable paths are rescanned instead
+        rescan_interval = min(monitor.check_interval for monitor in monitors) * 60 if monitors else 0
+        next_rescan = time.monotonic() + rescan_interval if unwatched else math.inf
+        try:
+            # The loop below is the only thing that draws; cells are mutated in
+            # place, so Live's refresh thread must not render concurrently
+            with Live(self.generate_display(), auto_refresh=False, console=console) as live:
+                while self.running:
+                    # One wall-clock reading per iteration, shared by all checks
+                    mono_now = time.monotonic()
+                    now = time.time()
+                    if mono_now >= next_hour:
+                        self.run_all_if_idle(now, mono_now)
+                        next_hour = self._next_hour_deadline()
+                    if mono_now >= next_save:
+                        self.save_state()
+                        next_save = mono_now + self.save_interval * 60
+                    if mono_now >= next_rescan:
+                        # Retry the watches, then rescan to catch activity they missed
+                        rescan = unwatched
+                        unwatched = [monitor for monitor in rescan if not monitor.start_watching()]
+                        for monitor in rescan:
+                            self._executor.submit(monitor.check_and_update_activity)
+                        next_rescan = mono_now + rescan_interval if unwatched else math.inf
+                    if mono_now >= next_refresh:
+                        # generate_display() rebuilds only on version changes
+                        live.update(self.generate_display(now, mono_now), refresh=True)
+                        next_refresh = mono_now + 1
+
+                    time.sleep(max(0, min(next_hour, next_save, next_refresh, next_rescan) - time.monotonic()))
+        finally:
+            for monitor in self.get_active_monitors():
+                monitor.stop_watching()
+                # Running jobs cannot be cancelled, and exit waits for the worker
+                monitor.cancel_execution()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.save_state()
 
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
@@ -3,7 +3,7 @@
 # requires-python = ">=3.10"
 # dependencies = [
 #     "rich>=13.0.0",
-#     "schedule>=1.2.0",
+#     "watchdog>=3.0",
 # ]
 # ///
 """
@@ -12,27 +12,82 @@ Monitors Claude activity files and runs claude command when idle at top of each
 """
 
 import argparse
+import asyncio
 import json
 import os
 import signal
-import subprocess
 import sys
 import time
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-import schedule
-from rich.console import Console
+from rich.console import Console, Group
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    # Without watchdog, activity is polled every check_interval instead
+    FileSystemEventHandler = object
+    Observer = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.JSONDecoder().decode
+
 console = Console()
 
 
+@lru_cache(maxsize=256)
+def _decode_project_id(project_id: str) -> str:
+    if project_id.startswith("-"):
+        return "/" + project_id[1:].replace("-", "/")
+    return project_id
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+@lru_cache(maxsize=256)
+def _project_text(project_id: str) -> Text:
+    # Rich Text is not mutated while rendering, so one instance can be reused
+    return Text(_decode_project_id(project_id), style="bold cyan")
+
+
+class ActivityEventHandler(FileSystemEventHandler):
+    """Forward .jsonl file events to the monitor."""
+
+    def __init__(self, monitor: "ClaudeIdleMonitor"):
+        super().__init__()
+        self.monitor = monitor
+
+    def on_created(self, event):
+        self._handle(event.src_path, event.is_directory)
+
+    def on_modified(self, event):
+        self._handle(event.src_path, event.is_directory)
+
+    def on_moved(self, event):
+        self._handle(event.dest_path, event.is_directory)
+
+    def _handle(self, path, is_directory: bool):
+        if is_directory:
+            return
+        path = os.fsdecode(path)
+        if path.endswith(".jsonl"):
+            self.monitor.record_activity(path)
+
+
 class ClaudeIdleMonitor:
     def __init__(
         self,
@@ -43,19 +98,101 @@ class ClaudeIdleMonitor:
         self.prompt = prompt
         self.check_interval = 0.5  # minutes (30 seconds)
         self.idle_threshold = 10  # minutes
+        self._idle_threshold_td = timedelta(minutes=self.idle_threshold)
 
         self.last_activity_time: Optional[datetime] = None
         self.last_activity_file: Optional[str] = None
         self.last_activity_project_file: Optional[str] = None
         self.last_prompt: Optional[str] = None
+        self._last_prompt_key: Optional[tuple[int, int]] = None  # (st_mtime_ns, st_size)
+        self._last_prompt_cached: Optional[str] = None
         self.last_check_time: Optional[datetime] = None
-        self.execution_logs: list[str] = []
         self.max_logs = 5
+        self.execution_logs: deque[str] = deque(maxlen=self.max_logs)
         self.running = True
 
         # File paths to monitor
         self.history_file = Path.home() / ".claude" / "history.jsonl"
         self.projects_dir = Path.home() / ".claude" / "projects"
+        # String forms for the per-check and per-event hot paths
+        self._history_file_str = str(self.history_file)
+        self._projects_dir_str = str(self.projects_dir)
+        self._projects_prefix = self._projects_dir_str + os.sep
+
+        # File system watcher, None when polling instead
+        self.observer = None
+
+        # Monotonic deadline of the next poll when watchdog is unavailable
+        self._next_check: Optional[float] = None
+
+        # Set by SIGINT/SIGTERM while _run() is active
+        self._shutdown_event: Optional[asyncio.Event] = None
+
+        # Configuration rows never change, so build them once
+        self._prompt_display = _truncate(self.prompt, 50)
+        self._config_table = self._create_status_grid()
+        self._config_table.add_row("", "")
+        self._config_table.add_row("Target Directory:", str(self.directory))
+        self._config_table.add_row("Prompt:", self._prompt_display)
+
+        # Layout and panels are reused; generate_display() only swaps their contents
+        self._status_panel = Panel(Group(), title="Claude Idle Monitor", border_style="blue")
+        self._logs_panel = Panel("", title="Execution Log", border_style="green")
+        self._layout = Layout()
+        self._layout.split_column(Layout(self._status_panel), Layout(self._logs_panel))
+
+        # Current time cell of the last generated display, and the state it shows
+        self._time_text: Optional[Text] = None
+        self._display_state_hash: Optional[int] = None
+
+        # Stat cache for project files: inode -> (path, st_mtime_ns)
+        self._stat_cache: dict[int, tuple[str, int]] = {}
+        self._latest_project: Optional[tuple[int, str]] = None  # (st_mtime_ns, path)
+        # Directory listings: dir path -> (st_mtime_ns, subdirs, jsonl files)
+        self._dir_cache: dict[str, tuple[int, list[str], list[str]]] = {}
+
+    def _iter_project_files(self, root: str) -> Iterator[tuple[str, os.stat_result]]:
+        """Yield (path, stat) for every .jsonl file below root (symlinks not followed).
+
+        A directory is only re-listed when its st_mtime_ns changes. Appending
+        to a file leaves its directory's mtime alone, so files are still stat()ed.
+        """
+        try:
+            dir_mtime_ns = os.stat(root).st_mtime_ns
+        except OSError:
+            self._dir_cache.pop(root, None)
+            return
+
+        listing = self._dir_cache.get(root)
+        if listing is None or listing[0] != dir_mtime_ns:
+            subdirs, files = [], []
+            try:
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(".jsonl"):
+                            files.append(entry.path)
+            except OSError:
+                # Unreadable or removed since the stat(); skip it like rglob did
+                self._dir_cache.pop(root, None)
+                return
+
+            # Forget listings of removed subdirectories and everything below them
+            if listing is not None:
+                for gone in set(listing[1]).difference(subdirs):
+                    for path in [p for p in self._dir_cache if p == gone or p.startswith(gone + os.sep)]:
+                        del self._dir_cache[path]
+
+            listing = self._dir_cache[root] = (dir_mtime_ns, subdirs, files)
+
+        for path in listing[2]:
+            try:
+                yield path, os.stat(path)
+            except OSError:
+                pass
+        for subdir in listing[1]:
+            yield from self._iter_project_files(subdir)
 
     def get_latest_modification_time(self) -> Optional[tuple[datetime, str, Optional[str]]]:
         """Get the most recent modification time and file paths.
@@ -66,35 +203,52 @@ class ClaudeIdleMonitor:
             - latest_file: Path to the most recently modified file (history or project)
             - latest_project_file: Path to the most recently modified project file (None if no project activity)
         """
-        latest_time = None
+        # Compare raw st_mtime_ns ints; convert to datetime once at the end
+        latest_ns = None
         latest_file = None
-        latest_project_time = None
         latest_project_file = None
 
         # Check history.jsonl
-        if self.history_file.exists():
-            mtime = datetime.fromtimestamp(self.history_file.stat().st_mtime)
-            if latest_time is None or mtime > latest_time:
-                latest_time = mtime
-                latest_file = str(self.history_file)
+        try:
+            latest_ns = os.stat(self._history_file_str).st_mtime_ns
+            latest_file = self._history_file_str
+        except OSError:
+            pass
 
         # Check all .jsonl files in projects directory
-        if self.projects_dir.exists():
-            for jsonl_file in self.projects_dir.rglob("*.jsonl"):
-                mtime = datetime.fromtimestamp(jsonl_file.stat().st_mtime)
+        if os.path.isdir(self._projects_dir_str):
+            changed = False
+            seen = set()
+            for path, st in self._iter_project_files(self._projects_dir_str):
+                inode = st.st_ino
+                mtime_ns = st.st_mtime_ns
+                seen.add(inode)
+                if self._stat_cache.get(inode) != (path, mtime_ns):
+                    self._stat_cache[inode] = (path, mtime_ns)
+                    changed = True
+
+            # Drop deleted files
+            for inode in self._stat_cache.keys() - seen:
+                del self._stat_cache[inode]
+                changed = True
+
+            # Only recompute the max when some file changed
+            if changed:
+                self._latest_project = max(
+                    ((mtime_ns, path) for path, mtime_ns in self._stat_cache.values()),
+                    default=None,
+                )
 
-                # Track overall latest
-                if latest_time is None or mtime > latest_time:
-                    latest_time = mtime
-                    latest_file = str(jsonl_file)
+            if self._latest_project:
+                latest_project_ns, latest_project_file = self._latest_project
 
-                # Track latest project file separately
-                if latest_project_time is None or mtime > latest_project_time:
-                    latest_project_time = mtime
-                    latest_project_file = str(jsonl_file)
+                # Track overall latest
+                if latest_ns is None or latest_project_ns > latest_ns:
+                    latest_ns = latest_project_ns
+                    latest_file = latest_project_file
 
-        if latest_time and latest_file:
-            return (latest_time, latest_file, latest_project_file)
+        if latest_ns is not None and latest_file:
+            return (datetime.fromtimestamp(latest_ns / 1e9), latest_file, latest_project_file)
         return None
 
     def decode_project_id(self, project_id: str) -> str:
@@ -103,30 +257,41 @@ class ClaudeIdleMonitor:
         Claude encodes project paths like: -Users-dj-github-darjeeling-glmctl
         This decodes it back to: /Users/dj/github/darjeeling/glmctl
         """
-        if project_id.startswith("-"):
-            return "/" + project_id[1:].replace("-", "/")
-        return project_id
+        return _decode_project_id(project_id)
 
     def get_last_prompt(self) -> Optional[str]:
         """Get the last prompt from history.jsonl file.
 
         Returns the 'display' field from the last line of history.jsonl.
+        Only the trailing block of the file is read, and not even that if
+        the file's (mtime, size) is unchanged since the last parse.
         """
         try:
-            if not self.history_file.exists():
-                return None
-
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if not lines:
-                    return None
-
-                # Get last non-empty line
-                for line in reversed(lines):
-                    line = line.strip()
-                    if line:
-                        data = json.loads(line)
-                        return data.get('display')
+            # A missing file raises and falls through to return None
+            st = os.stat(self._history_file_str)
+            key = (st.st_mtime_ns, st.st_size)
+            if key == self._last_prompt_key:
+                return self._last_prompt_cached
+
+            size = st.st_size
+            with open(self._history_file_str, 'rb') as f:
+                # Read the last 8 KiB, growing only if the last line is longer
+                block = 8192
+                while True:
+                    start = max(0, size - block)
+                    f.seek(start)
+                    tail = f.read().decode('utf-8', 'replace')
+                    if "\n" in tail.rstrip() or start == 0:
+                        break
+                    block *= 2
+
+            # Get last non-empty line
+            last = next((line for line in reversed(tail.splitlines()) if line.strip()), None)
+            prompt = _json_loads(last).get('display') if last else None
+
+            self._last_prompt_key = key
+            self._last_prompt_cached = prompt
+            return prompt
 
         except Exception:
             # Silently ignore errors
@@ -134,23 +299,28 @@ class ClaudeIdleMonitor:
 
         return None
 
-    def is_idle(self) -> bool:
+    def is_idle(self, now: Optional[datetime] = None) -> bool:
         """Check if Claude has been idle for longer than threshold."""
         if self.last_activity_time is None:
             return False
 
-        idle_duration = datetime.now() - self.last_activity_time
-        return idle_duration >= timedelta(minutes=self.idle_threshold)
+        if now is None:
+            now = datetime.now()
+        idle_duration = now - self.last_activity_time
+        return idle_duration >= self._idle_threshold_td
 
-    def get_idle_duration(self) -> Optional[timedelta]:
+    def get_idle_duration(self, now: Optional[datetime] = None) -> Optional[timedelta]:
         """Get current idle duration."""
         if self.last_activity_time is None:
             return None
-        return datetime.now() - self.last_activity_time
+        if now is None:
+            now = datetime.now()
+        return now - self.last_activity_time
 
-    def get_next_hour(self) -> datetime:
+    def get_next_hour(self, now: Optional[datetime] = None) -> datetime:
         """Get the next top of the hour."""
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         return next_hour
 
@@ -165,13 +335,38 @@ class ClaudeIdleMonitor:
         # Update last prompt from history.jsonl
         self.last_prompt = self.get_last_prompt()
 
-    def run_claude(self):
-        """Execute claude command if idle."""
-        if not self.is_idle():
-            return
+    def record_activity(self, file_path: str):
+        """Record activity reported by the file system watcher."""
+        if file_path == self._history_file_str:
+            self.last_activity_time = datetime.now()
+            self.last_activity_file = file_path
+            self.last_prompt = self.get_last_prompt()
+        elif file_path.startswith(self._projects_prefix):
+            self.last_activity_time = datetime.now()
+            self.last_activity_file = file_path
+            self.last_activity_project_file = file_path
+
+    def start_watching(self) -> bool:
+        """Start watching activity files.
+
+        Returns False if watchdog is unavailable or there is nothing to watch,
+        in which case the caller should poll instead.
+        """
+        if Observer is None or not self.history_file.parent.is_dir():
+            return False
+
+        handler = ActivityEventHandler(self)
+        self.observer = Observer()
+        self.observer.schedule(handler, str(self.history_file.parent), recursive=False)
+        if self.projects_dir.is_dir():
+            self.observer.schedule(handler, str(self.projects_dir), recursive=True)
+        self.observer.start()
+        return True
 
+    async def run_claude(self):
+        """Execute claude command if idle without blocking the event loop."""
         now = datetime.now()
-        if now.minute != 0:  # Only run at top of the hour
+        if not self.is_idle(now):
             return
 
         timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -179,12 +374,21 @@ class ClaudeIdleMonitor:
         self.add_log(log_msg)
 
         try:
-            subprocess.run(
-                ["claude", "-p", self.prompt],
-                cwd=self.directory,
-                capture_output=False,
-                timeout=None,
+            proc = await asyncio.create_subprocess_exec(
+                "claude", "-p", self.prompt,
+                cwd=str(self.directory),
             )
+            try:
+                await proc.wait()
+            finally:
+                # Cancelled by shutdown: don't leave claude running as an orphan
+                if proc.returncode is None:
+                    proc.terminate()
+                    try:
+                        await asyncio.wait_for(proc.wait(), 5)
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        await proc.wait()
             self.add_log(f"[{timestamp}] Execution completed")
         except Exception as e:
             # Silently ignore errors as per requirements
@@ -193,21 +397,30 @@ class ClaudeIdleMonitor:
     def add_log(self, message: str):
         """Add a log message (keep last N messages)."""
         self.execution_logs.append(message)
-        if len(self.execution_logs) > self.max_logs:
-            self.execution_logs.pop(0)
 
-    def generate_display(self) -> Layout:
+    @staticmethod
+    def _create_status_grid() -> Table:
+        """Create a two-column label/value grid for the status panel."""
+        table = Table.grid(padding=(0, 2))
+        # Fixed label width keeps the dynamic and configuration grids aligned
+        table.add_column(style="cyan", justify="right", min_width=len("Target Directory:"))
+        table.add_column(style="white")
+        return table
+
+    def generate_display(self, now: Optional[datetime] = None) -> Layout:
         """Generate the TUI display."""
-        layout = Layout()
+        if now is None:
+            now = datetime.now()
+        idle_duration = self.get_idle_duration(now)
+        idle = idle_duration is not None and idle_duration >= self._idle_threshold_td
 
         # Create status table
-        status_table = Table.grid(padding=(0, 2))
-        status_table.add_column(style="cyan", justify="right")
-        status_table.add_column(style="white")
+        status_table = self._create_status_grid()
 
-        # Current time
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        status_table.add_row("Current Time:", current_time)
+        # Current time, updated in place while nothing else changes
+        current_time = now.strftime("%Y-%m-%d %H:%M:%S")
+        self._time_text = Text(current_time)
+        status_table.add_row("Current Time:", self._time_text)
 
         # Last activity
         if self.last_activity_time:
@@ -215,37 +428,27 @@ class ClaudeIdleMonitor:
             status_table.add_row("Last Activity:", last_activity)
 
             # Show last project (always show if available)
-            if self.last_activity_project_file:
-                project_path = Path(self.last_activity_project_file)
-                projects_dir = Path.home() / ".claude" / "projects"
-                try:
-                    relative = project_path.relative_to(projects_dir)
-                    project_id = relative.parts[0]
-                    # Decode project ID to actual path
-                    actual_path = self.decode_project_id(project_id)
-                    status_table.add_row(
-                        "Last Project:",
-                        Text(actual_path, style="bold cyan")
-                    )
-                except ValueError:
-                    pass
+            project_file = self.last_activity_project_file
+            if project_file and project_file.startswith(self._projects_prefix):
+                project_id = project_file[len(self._projects_prefix):].split(os.sep, 1)[0]
+                # Decode project ID to actual path
+                status_table.add_row("Last Project:", _project_text(project_id))
 
             # Show last prompt
-            if self.last_prompt:
+            last_prompt = self.last_prompt
+            if last_prompt:
                 # Truncate if too long
-                prompt_display = self.last_prompt[:100] + "..." if len(self.last_prompt) > 100 else self.last_prompt
                 status_table.add_row(
                     "Last Prompt:",
-                    Text(prompt_display, style="dim white")
+                    Text(_truncate(last_prompt, 100), style="dim white")
                 )
         else:
             status_table.add_row("Last Activity:", "Checking...")
 
         # Idle status
-        idle_duration = self.get_idle_duration()
         if idle_duration:
             minutes = int(idle_duration.total_seconds() / 60)
-            if self.is_idle():
+            if idle:
                 idle_text = Text(f"IDLE ({minutes} minutes)", style="bold red")
             else:
                 idle_text = Text(f"Active ({minutes} minutes since last activity)", style="bold green")
@@ -254,51 +457,117 @@ class ClaudeIdleMonitor:
             status_table.add_row("Status:", "Initializing...")
 
         # Next execution (if idle)
-        if self.is_idle():
-            next_hour = self.get_next_hour().strftime("%H:%M:%S")
+        if idle:
+            next_hour = self.get_next_hour(now).strftime("%H:%M:%S")
             status_table.add_row("Next Execution:", Text(next_hour, style="bold yellow"))
 
-        # Configuration
-        status_table.add_row("", "")
-        status_table.add_row("Target Directory:", str(self.directory))
-        status_table.add_row("Prompt:", self.prompt[:50] + "..." if len(self.prompt) > 50 else self.prompt)
-
-        # Create logs panel
-        logs_text = "\n".join(self.execution_logs) if self.execution_logs else "No executions yet"
-
-        # Combine into layout
-        layout.split_column(
-            Layout(Panel(status_table, title="Claude Idle Monitor", border_style="blue")),
-            Layout(Panel(logs_text, title="Execution Log", border_style="green")),
-        )
+        # Swap the panel contents of the cached layout
+        self._status_panel.renderable = Group(status_table, self._config_table)
+        self._logs_panel.renderable = "\n".join(self.execution_logs) if self.execution_logs else "No executions yet"
 
-        return layout
+        return self._layout
 
     def start(self):
         """Start the monitoring loop with TUI."""
         # Initial check
         self.check_and_update_activity()
 
-        # Schedule tasks
-        schedule.every(self.check_interval).minutes.do(self.check_and_update_activity)
-        schedule.every().hour.at(":00").do(self.run_claude)
-
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-
-        # Run with live display
-        with Live(self.generate_display(), refresh_per_second=1, console=console) as live:
-            while self.running:
-                schedule.run_pending()
-                live.update(self.generate_display())
-                time.sleep(1)
+        asyncio.run(self._run())
+        console.print("\n[yellow]Shutting down monitor...[/yellow]")
 
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully."""
+    async def _run(self):
+        """Run the TUI, activity and hourly tasks on one event loop until a shutdown signal."""
+        self._shutdown_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._shutdown)
+
+        # _refresh_tui() is the only thing that draws; no Rich refresh thread
+        with Live(self.generate_display(), auto_refresh=False, console=console) as live:
+            tasks = [
+                asyncio.create_task(self._refresh_tui(live)),
+                asyncio.create_task(self._hourly_trigger()),
+            ]
+            # Poll only when file events are unavailable
+            if not self.start_watching():
+                tasks.append(asyncio.create_task(self._activity_watcher()))
+
+            # The tasks loop until cancelled, so any of them finishing means it failed
+            shutdown = asyncio.create_task(self._shutdown_event.wait())
+            try:
+                done, _ = await asyncio.wait([shutdown, *tasks], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                shutdown.cancel()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                if self.observer is not None:
+                    self.observer.stop()
+                    self.observer.join()
+
+            # Surface the failure instead of running on without the task
+            for task in done:
+                if task is not shutdown:
+                    task.result()
+
+    def _compute_display_state_hash(self, now: datetime) -> int:
+        """Hash everything shown in the TUI except the current time."""
+        idle_duration = self.get_idle_duration(now)
+        idle_minutes = int(idle_duration.total_seconds() / 60) if idle_duration else None
+        return hash((
+            self.last_activity_time,
+            self.last_activity_project_file,
+            self.last_prompt,
+            idle_duration is not None and idle_duration >= self._idle_threshold_td,
+            idle_minutes,
+            tuple(self.execution_logs),
+        ))
+
+    async def _refresh_tui(self, live: Live):
+        """Update the TUI once per second, rebuilding it only on state changes."""
+        next_refresh = time.monotonic()
+        while self.running:
+            now = datetime.now()
+            state_hash = self._compute_display_state_hash(now)
+            if state_hash != self._display_state_hash:
+                self._display_state_hash = state_hash
+                live.update(self.generate_display(now), refresh=True)
+            else:
+                self._time_text.plain = now.strftime("%Y-%m-%d %H:%M:%S")
+                live.refresh()
+
+            # Sleep to a fixed deadline so render time does not accumulate as drift
+            next_refresh = max(next_refresh + 1, time.monotonic())
+            await asyncio.sleep(next_refresh - time.monotonic())
+
+    async def _activity_watcher(self):
+        """Poll activity files every check_interval minutes."""
+        interval = self.check_interval * 60
+        self._next_check = time.monotonic() + interval
+        while self.running:
+            await asyncio.sleep(max(0.0, self._next_check - time.monotonic()))
+            self.check_and_update_activity()
+
+            # Skip missed checks (e.g. after sleep) instead of running them back to back
+            self._next_check += interval
+            if self._next_check <= time.monotonic():
+                self._next_check = time.monotonic() + interval
+
+    async def _hourly_trigger(self):
+        """Sleep until each top of the hour, then run claude if idle."""
+        next_hour = self.get_next_hour()
+        while self.running:
+            await asyncio.sleep(max(0.0, (next_hour - datetime.now()).total_seconds()))
+            await self.run_claude()
+
+            # Advance from the deadline itself so an early wake-up cannot rerun
+            # the same hour, and skip hours missed by a long claude run
+            next_hour = self.get_next_hour(max(datetime.now(), next_hour))
+
+    def _shutdown(self):
+        """Handle shutdown signals by letting _run() cancel its tasks."""
         self.running = False
-        console.print("\n[yellow]Shutting down monitor...[/yellow]")
-        sys.exit(0)
+        self._shutdown_event.set()
 
 
 def main():